@@ -1,36 +1,80 @@
 """Functions for loading and converting data."""
 
-import gzip
+import functools
+import io
 import itertools
-import json
 import logging
-from fractions import Fraction
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Iterable, Iterator
 
+import ijson
+import numpy as np
 from pymongo.collection import Collection
 from pysam import TabixFile
 
 from gens.crud.samples import get_sample
 from gens.models.genomic import Chromosome, GenomicRegion
 from gens.models.sample import GenomeCoverage, SampleInfo, ScatterDataType, ZoomLevel
+from gens.utils import open_gzip
 
 BAF_SUFFIX = ".baf.bed.gz"
 COV_SUFFIX = ".cov.bed.gz"
 JSON_SUFFIX = ".overview.json.gz"
 
+OVERVIEW_WORKERS = 8
+# Max number of open tabix files kept by each thread
+TABIX_CACHE_SIZE = 32
+
+_CHROM_VALUES: tuple[str, ...] = tuple(chrom.value for chrom in Chromosome)
+
+# Columns of scatter data bed files, the first, <zoom>_<chromosome>, is skipped
+_TABIX_COLUMNS: tuple[int, ...] = (1, 2, 3)
+_TABIX_DTYPE = np.dtype([("start", np.int64), ("end", np.int64), ("value", np.float32)])
+
 
 LOG = logging.getLogger(__name__)
 
+_thread_local = threading.local()
+
+# Kept for the lifetime of the process so that the threads, and the tabix files
+# they have opened, are reused between requests
+_overview_executor = ThreadPoolExecutor(
+    max_workers=OVERVIEW_WORKERS, thread_name_prefix="gens-overview"
+)
+
+
+def _open_tabix(path: str, _mtime_ns: int) -> TabixFile:
+    """Open a tabix file, the modification time is only used as cache key."""
+    return TabixFile(path)
+
+
+def open_tabix(path: Path) -> TabixFile:
+    """Get a tabix file handle, reusing handles for unchanged files.
+
+    Opening a tabix file loads its index, reusing the handle avoids doing that
+    for every request. Tabix file handles can not be shared between threads so
+    every thread keeps its own cache.
+    """
+    try:
+        open_cached_tabix = _thread_local.open_cached_tabix
+    except AttributeError:
+        open_cached_tabix = functools.lru_cache(maxsize=TABIX_CACHE_SIZE)(_open_tabix)
+        _thread_local.open_cached_tabix = open_cached_tabix
+    return open_cached_tabix(str(path), path.stat().st_mtime_ns)
+
 
 def tabix_query(
     tbix: TabixFile,
     zoom_level: ZoomLevel,
     region: GenomicRegion,
     reduce: float | None = None,
-) -> list[list[str]]:
+) -> Iterator[str]:
     """
-    Call tabix and generate an array of strings for each line it returns.
+    Call tabix and iterate over the lines it returns.
+
+    If reduce is given, only every round(1 / reduce):th line is kept.
     """
 
     # Get data from bed file
@@ -42,28 +86,36 @@ def tabix_query(
         records = iter([])
 
     if reduce is not None:
-        n_true, tot = Fraction(reduce).limit_denominator(1000).as_integer_ratio()
-        cmap = itertools.cycle([1] * n_true + [0] * (tot - n_true))
-        records = itertools.compress(records, cmap)
+        step = max(1, round(1 / reduce))
+        records = itertools.islice(records, 0, None, step)
 
-    return [r.split("\t") for r in records]
+    return records
 
 
-def parse_raw_tabix(tabix_result: list[list[str]]) -> GenomeCoverage:
+def parse_raw_tabix(tabix_result: Iterable[str]) -> GenomeCoverage:
+    """Parse tabix lines into positions and values.
+
+    The lines are joined and parsed in one go by NumPy, directly into typed
+    start, end and value columns.
+    """
     zoom: str | None = None
     region: str | None = None
-    values: list[float] = []
-    positions: list[int] = []
-    entry: list[str]
-
-    if len(tabix_result) > 0:
-        zoom, region = tabix_result[0][0].split("_")
-
-    for entry in tabix_result:
-        start = int(entry[1])
-        end = int(entry[2])
-        positions.append(round((start + end) / 2))
-        values.append(float(entry[3]))
+    positions = np.empty(0, dtype=np.int32)
+    values = np.empty(0, dtype=np.float32)
+
+    raw_data = "\n".join(tabix_result)
+    if raw_data:
+        zoom, region = raw_data[: raw_data.index("\t")].split("_")
+        data = np.loadtxt(
+            io.StringIO(raw_data),
+            delimiter="\t",
+            usecols=_TABIX_COLUMNS,
+            dtype=_TABIX_DTYPE,
+            ndmin=1,
+        )
+        positions = ((data["start"] + data["end"]) >> 1).astype(np.int32)
+        values = data["value"]
+
     return GenomeCoverage(
         region=region,
         zoom=None if zoom is None else ZoomLevel(zoom),
@@ -78,22 +130,16 @@ def get_scatter_data(
     case_id: str,
     region: GenomicRegion,
     data_type: ScatterDataType,
-    zoom_level: Literal["o", "a", "b", "c", "d"],
+    zoom_level: ZoomLevel,
 ) -> GenomeCoverage:  # type: ignore
     """Development entrypoint for getting the coverage of a region."""
     # TODO respond with 404 error if file is not found
     sample_obj = get_sample(collection, sample_id, case_id)
 
     if data_type == ScatterDataType.COV:
-        tabix_file = TabixFile(str(sample_obj.coverage_file))
+        tabix_file = open_tabix(sample_obj.coverage_file)
     else:
-        tabix_file = TabixFile(str(sample_obj.baf_file))
-
-    valid_zoom_levels = {"o", "a", "b", "c", "d"}
-    if zoom_level not in valid_zoom_levels:
-        raise ValueError(
-            f"Unexpected zoom level: {zoom_level}, valid are: {valid_zoom_levels}"
-        )
+        tabix_file = open_tabix(sample_obj.baf_file)
 
     # Tabix
     record_name = f"{zoom_level}_{region.chromosome}"
@@ -104,53 +150,63 @@ def get_scatter_data(
         LOG.error(err)
         records = iter([])
 
-    return parse_raw_tabix([r.split("\t") for r in records])
+    return parse_raw_tabix(records)
 
 
 def get_overview_data(file: Path, data_type: ScatterDataType) -> list[GenomeCoverage]:
-    """Read overview data from json file."""
+    """Read overview data from json file.
+
+    The file is parsed one chromosome at a time to limit the memory usage.
+    """
 
     if not file.is_file():
         raise FileNotFoundError(f"Overview file {file} is not found")
 
-    with gzip.open(file, "r") as json_gz:
-        json_data = json.loads(json_gz.read().decode("utf-8"))
-
+    data_key = "cov" if data_type == ScatterDataType.COV else "baf"
     results: list[GenomeCoverage] = []
-    for chrom in json_data.keys():
-        chrom_data = json_data[chrom][
-            "cov" if data_type == ScatterDataType.COV else "baf"
-        ]
-
-        results.append(
-            GenomeCoverage(
-                region=chrom,
-                position=[pos for (pos, _) in chrom_data],
-                value=[val for (_, val) in chrom_data],
+    with open_gzip(file, "rb") as json_gz:
+        for chrom, chrom_obj in ijson.kvitems(json_gz, "", use_float=True):
+            chrom_data = np.asarray(chrom_obj[data_key], dtype=np.float64)
+            # chromosomes without data gives an empty one-dimensional array
+            chrom_data = chrom_data.reshape(-1, 2)
+
+            results.append(
+                GenomeCoverage(
+                    region=chrom,
+                    position=chrom_data[:, 0].astype(np.int32),
+                    value=chrom_data[:, 1].astype(np.float32),
+                )
             )
-        )
     return results
 
 
+def _get_chromosome_overview(tabix_path: Path, chrom: str) -> GenomeCoverage | None:
+    """Read the "o" resolution of one chromosome."""
+    tabix_file = open_tabix(tabix_path)
+    record_name = f"o_{chrom}"
+    try:
+        records = tabix_file.fetch(record_name)
+    except ValueError as err:
+        LOG.error(err)
+        return None
+
+    return parse_raw_tabix(records)
+
+
 def get_overview_from_tabix(
     sample: SampleInfo, data_type: ScatterDataType
 ) -> list[GenomeCoverage]:
-    """Generate overview data using the "o" resolution from bed files."""
+    """Generate overview data using the "o" resolution from bed files.
+
+    The chromosomes are read in parallel.
+    """
 
     if data_type == ScatterDataType.COV:
-        tabix_file = TabixFile(str(sample.coverage_file))
+        tabix_path = sample.coverage_file
     else:
-        tabix_file = TabixFile(str(sample.baf_file))
+        tabix_path = sample.baf_file
 
-    results: list[GenomeCoverage] = []
-    for chrom in Chromosome:
-        record_name = f"o_{chrom.value}"
-        try:
-            records = tabix_file.fetch(record_name)
-        except ValueError as err:
-            LOG.error(err)
-            continue
-
-        results.append(parse_raw_tabix([r.split("\t") for r in records]))
-
-    return results
+    chrom_results = _overview_executor.map(
+        functools.partial(_get_chromosome_overview, tabix_path), _CHROM_VALUES
+    )
+    return [chrom_cov for chrom_cov in chrom_results if chrom_cov is not None]
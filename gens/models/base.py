@@ -3,8 +3,10 @@
 import datetime
 from typing import Annotated, Any, Callable, TypeAlias
 
+import numpy as np
 from bson import ObjectId
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import core_schema
 
 from gens.utils import get_timestamp
@@ -56,6 +58,46 @@ class _ObjectIdPydanticAnnotation:
 PydanticObjectId: TypeAlias = Annotated[ObjectId, _ObjectIdPydanticAnnotation]
 
 
+class _NdArrayPydanticAnnotation:
+    """Store values as a one-dimensional numpy array of a fixed dtype.
+
+    The array is kept as is when dumping to python and serialized as a list in
+    json. Arrays are made contiguous so that they can be serialized by orjson.
+    """
+
+    def __init__(self, dtype: type[np.generic]):
+        self.dtype = np.dtype(dtype)
+
+    def __get_pydantic_core_schema__(
+        self,
+        _source_type: Any,
+        _handler: Callable[[Any], core_schema.CoreSchema],
+    ) -> core_schema.CoreSchema:
+        def validate_array(input_value: Any) -> np.ndarray:
+            return np.ascontiguousarray(input_value, dtype=self.dtype).reshape(-1)
+
+        return core_schema.no_info_plain_validator_function(
+            validate_array,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda array: array.tolist(), when_used="json"
+            ),
+        )
+
+    def __get_pydantic_json_schema__(
+        self, _core_schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        item_schema = (
+            core_schema.int_schema()
+            if np.issubdtype(self.dtype, np.integer)
+            else core_schema.float_schema()
+        )
+        return handler(core_schema.list_schema(item_schema))
+
+
+Int32Array: TypeAlias = Annotated[np.ndarray, _NdArrayPydanticAnnotation(np.int32)]
+Float32Array: TypeAlias = Annotated[np.ndarray, _NdArrayPydanticAnnotation(np.float32)]
+
+
 class User(CreatedAtModel, ModifiedAtModel):
     """Stores user information."""
 
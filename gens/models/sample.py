@@ -1,7 +1,6 @@
 """Models related to sample information."""
 
-import gzip
-import re
+import functools
 from enum import StrEnum
 from pathlib import Path
 
@@ -9,7 +8,9 @@ from pydantic import Field, computed_field, field_serializer, field_validator
 from pydantic.types import FilePath
 from pydantic_extra_types.color import Color
 
-from .base import CreatedAtModel, RWModel
+from gens.utils import open_gzip
+
+from .base import CreatedAtModel, Float32Array, Int32Array, RWModel
 from .genomic import GenomeBuild
 
 
@@ -23,7 +24,16 @@ def _get_tabix_path(path: Path, check: bool = False) -> Path:
     return idx_path
 
 
-SAMPLE_RECORD_PATTERN = re.compile(r"^[A-Za-z0-9]+_(?:[1-9]|1[0-9]|2[0-2]|X|Y)$")
+@functools.lru_cache(maxsize=256)
+def _read_first_line(path: str, _mtime_ns: int) -> str:
+    """Read the first line of a gzipped sample file.
+
+    Samples are validated every time they are read from the database, the
+    modification time is part of the cache key so that changed files are read
+    again.
+    """
+    with open_gzip(path, "rb") as handle:
+        return handle.readline().rstrip(b"\r\n").decode("utf-8")
 
 
 class ScatterDataType(StrEnum):
@@ -41,6 +51,14 @@ class ZoomLevel(StrEnum):
     overview = "o"
 
 
+# Valid values of the first column in sample files, i.e. <zoom>_<chromosome>
+SAMPLE_RECORD_NAMES = frozenset(
+    f"{zoom}_{chrom}"
+    for zoom in ["0", *ZoomLevel]
+    for chrom in [*map(str, range(1, 23)), "X", "Y"]
+)
+
+
 class SampleSex(StrEnum):
     """Valid sample sexes."""
 
@@ -97,8 +115,7 @@ class SampleInfo(RWModel, CreatedAtModel):
             raise ValueError(f"Sample file not found: {path}")
 
         try:
-            with gzip.open(path, "rt", encoding="utf-8") as handle:
-                first_line = handle.readline().strip()
+            first_line = _read_first_line(str(path), path.stat().st_mtime_ns)
         except OSError as err:
             raise ValueError(f"Could not read sample file {path}: {err}") from err
 
@@ -111,7 +128,7 @@ class SampleInfo(RWModel, CreatedAtModel):
                 f"Sample file should contain four column, found: {len(columns)}. First line: {first_line}"
             )
 
-        if not SAMPLE_RECORD_PATTERN.match(columns[0]):
+        if columns[0] not in SAMPLE_RECORD_NAMES:
             raise ValueError(
                 "First column should combine zoom and chromosome: 0_1, a_X, d_22"
             )
@@ -156,12 +173,12 @@ class SampleInfo(RWModel, CreatedAtModel):
 class GenomeCoverage(RWModel):
     """Contains genome coverage info for scatter plots.
 
-    The genome coverage is represented by paired list of position and value.
+    The genome coverage is represented by paired arrays of position and value.
     """
 
     region: str | None
-    position: list[int]
-    value: list[float]
+    position: Int32Array
+    value: Float32Array
     zoom: ZoomLevel | None = None
 
 
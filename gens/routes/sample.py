@@ -2,7 +2,6 @@
 
 from http import HTTPStatus
 from pathlib import Path
-from typing import Literal
 
 from fastapi import APIRouter
 
@@ -15,9 +14,10 @@ from gens.models.sample import (
     MultipleSamples,
     SampleInfo,
     ScatterDataType,
+    ZoomLevel,
 )
 
-from .utils import ApiTags, GensDb
+from .utils import ApiTags, GensDb, NumpyJSONResponse
 
 router = APIRouter(prefix="/samples")
 
@@ -53,6 +53,8 @@ async def get_sample_route(
 @router.get(
     "/sample/{data_type}",
     tags=[ApiTags.SAMPLE],
+    response_model=GenomeCoverage,
+    response_class=NumpyJSONResponse,
 )
 async def get_genome_coverage(
     sample_id: str,
@@ -62,13 +64,13 @@ async def get_genome_coverage(
     db: GensDb,
     start: int = 1,
     end: int | None = None,
-    zoom_level: Literal["o", "a", "b", "c", "d"] = "a",
-) -> GenomeCoverage:
+    zoom_level: ZoomLevel = ZoomLevel.A,
+) -> NumpyJSONResponse:
     """Get genome coverage information."""
 
     region = GenomicRegion(chromosome=chromosome, start=start, end=end)
 
-    return get_scatter_data(
+    coverage = get_scatter_data(
         collection=db.get_collection(SAMPLES_COLLECTION),
         sample_id=sample_id,
         case_id=case_id,
@@ -76,15 +78,21 @@ async def get_genome_coverage(
         data_type=data_type,
         zoom_level=zoom_level,
     )
+    return NumpyJSONResponse(coverage.model_dump())
 
 
-@router.get("/sample/{data_type}/overview", tags=[ApiTags.SAMPLE])
+@router.get(
+    "/sample/{data_type}/overview",
+    tags=[ApiTags.SAMPLE],
+    response_model=list[GenomeCoverage],
+    response_class=NumpyJSONResponse,
+)
 async def get_cov_overview(
     sample_id: str,
     case_id: str,
     data_type: ScatterDataType,
     db: GensDb,
-):
+) -> NumpyJSONResponse:
     """Get aggregated overview coverage information."""
 
     sample_info: SampleInfo = samples.get_sample(
@@ -95,6 +103,8 @@ async def get_cov_overview(
         sample_info.overview_file is not None
         and Path(sample_info.overview_file).is_file()
     ):
-        return get_overview_data(sample_info.overview_file, data_type)
+        overview = get_overview_data(sample_info.overview_file, data_type)
+    else:
+        overview = get_overview_from_tabix(sample_info, data_type)
 
-    return get_overview_from_tabix(sample_info, data_type)
+    return NumpyJSONResponse([chrom_cov.model_dump() for chrom_cov in overview])
@@ -3,7 +3,9 @@
 from enum import StrEnum
 from typing import Annotated, Any
 
+import orjson
 from fastapi import Depends
+from fastapi.responses import JSONResponse
 from pymongo.database import Database
 
 from gens.adapters.base import InterpretationAdapter
@@ -24,3 +26,14 @@ class ApiTags(StrEnum):
     VAR = "variant"
     SAMPLE_ANNOT = "sample-annotation"
     GENE_LIST = "gene-list"
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSON response that serializes numpy arrays directly with orjson.
+
+    Use it with content dumped in python mode, model.model_dump(), so that
+    array fields are not converted to lists first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
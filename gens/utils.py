@@ -1,8 +1,24 @@
 """Utility functions."""
 
 import datetime
+from pathlib import Path
+from typing import IO, Any
+
+try:
+    from isal import igzip as gzip
+except ImportError:
+    import gzip  # type: ignore[no-redef]
 
 
 def get_timestamp() -> datetime.datetime:
     """Get datetime timestamp in utc timezone."""
     return datetime.datetime.now(tz=datetime.timezone.utc)
+
+
+def open_gzip(path: str | Path, mode: str = "rb", **kwargs: Any) -> IO[Any]:
+    """Open a gzipped file.
+
+    Use the ISA-L decompressor if isal is installed, it is considerably faster
+    than the zlib based gzip module.
+    """
+    return gzip.open(path, mode, **kwargs)
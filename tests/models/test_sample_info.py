@@ -0,0 +1,43 @@
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from gens.models.sample import SampleInfo
+
+
+def write_sample_track(file_path: Path, content: str) -> Path:
+    with gzip.open(file_path, "wt", encoding="utf-8") as fh:
+        fh.write(content)
+    return file_path
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "a_1\t0\t1\n",
+        "foo\t0\t1\t0.1\n",
+        "e_1\t0\t1\t0.1\n",
+        "a_MT\t0\t1\t0.1\n",
+        "a_1\tstart\t1\t0.1\n",
+    ],
+)
+def test_validate_sample_file_invalid(tmp_path: Path, content: str):
+    track = write_sample_track(tmp_path / "track.gz", content)
+
+    with pytest.raises(ValueError):
+        SampleInfo._validate_sample_file(track)
+
+
+def test_validate_sample_file_rereads_modified_file(tmp_path: Path):
+    track = write_sample_track(tmp_path / "track.gz", "a_1\t0\t1\t0.1\n")
+    assert SampleInfo._validate_sample_file(track) == track
+
+    write_sample_track(track, "foo\t0\t1\t0.1\n")
+    stat = track.stat()
+    os.utime(track, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    with pytest.raises(ValueError):
+        SampleInfo._validate_sample_file(track)
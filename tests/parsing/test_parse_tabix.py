@@ -0,0 +1,33 @@
+from gens.io import parse_raw_tabix
+
+
+def test_parse_raw_tabix():
+    lines = [
+        "a_1\t0\t10\t0.5",
+        "a_1\t10\t21\t-1.25",
+        "a_1\t21\t24\t0.0",
+    ]
+    coverage = parse_raw_tabix(lines)
+
+    assert coverage.region == "1"
+    assert coverage.zoom == "a"
+    assert list(coverage.position) == [5, 15, 22]
+    assert list(coverage.value) == [0.5, -1.25, 0.0]
+
+
+def test_parse_raw_tabix_single_line():
+    coverage = parse_raw_tabix(["o_X\t100\t200\t0.25"])
+
+    assert coverage.region == "X"
+    assert coverage.zoom == "o"
+    assert list(coverage.position) == [150]
+    assert list(coverage.value) == [0.25]
+
+
+def test_parse_raw_tabix_empty():
+    coverage = parse_raw_tabix([])
+
+    assert coverage.region is None
+    assert coverage.zoom is None
+    assert len(coverage.position) == 0
+    assert len(coverage.value) == 0